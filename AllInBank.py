@@ -4,7 +4,7 @@ Poker Bank App — Streamlit (with Save/Load, dropdown cash‑outs, and charts)
 Track poker chips as money (buy‑ins, rebuys/top‑ups, cash‑outs) and compute minimal
 settlement (who owes whom how much). Now includes:
 
-- Save/Load games to resume later (JSON files on disk)
+- Save/Load games to resume later (pickle files on disk; older JSON saves still load)
 - Option to **start a new game** or **continue a previous game**
 - Cash‑outs via **dropdown selector** (one player at a time)
 - Simple, clear **charts** (buy‑ins & net results) + existing tables
@@ -20,14 +20,23 @@ Notes
 """
 
 from __future__ import annotations
+import io
 import json
-from typing import Dict
+import os
+import pickle
+import re
+import tempfile
+from typing import Dict, List
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
-import altair as alt
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
 
 from bank_core import Ledger, Player, min_cash_flow_settlement, normalize_player_name
 
@@ -38,42 +47,106 @@ from bank_core import Ledger, Player, min_cash_flow_settlement, normalize_player
 SAVE_DIR = Path.cwd() / "poker_bank_saves"
 SAVE_DIR.mkdir(exist_ok=True)
 
+# Placeholder shown in the money metrics before anything is recorded.
+_EMPTY_METRIC = "—"
+
+# st.cache_data is shared by every session of the app; bound each ledger-keyed
+# cache so old game states get evicted.
+_CACHE_MAX_ENTRIES = 64
+
+
+_THEME_CSS = """
+    <style>
+        .stApp {
+            background: radial-gradient(circle at top right, #1f2937 0%, #111827 35%, #030712 100%);
+        }
+        [data-testid="stMetric"] {
+            background: linear-gradient(135deg, rgba(30, 41, 59, 0.92), rgba(15, 23, 42, 0.92));
+            border: 1px solid rgba(148, 163, 184, 0.35);
+            border-radius: 12px;
+            padding: 0.75rem;
+            contain: layout style;
+        }
+        .hero-card {
+            background: linear-gradient(130deg, rgba(30, 58, 138, 0.65), rgba(22, 101, 52, 0.5));
+            border: 1px solid rgba(255, 255, 255, 0.12);
+            border-radius: 14px;
+            padding: 0.9rem 1rem;
+            margin-bottom: 0.8rem;
+            contain: layout style;
+        }
+        .hero-card h3 {
+            margin: 0;
+            font-size: 1.25rem;
+        }
+        .hero-card p {
+            margin: 0.2rem 0 0;
+            color: #dbeafe;
+        }
+    </style>
+    """
+
 
 def apply_theme() -> None:
-    st.markdown(
-        """
-        <style>
-            .stApp {
-                background: radial-gradient(circle at top right, #1f2937 0%, #111827 35%, #030712 100%);
-            }
-            [data-testid="stMetric"] {
-                background: linear-gradient(135deg, rgba(30, 41, 59, 0.92), rgba(15, 23, 42, 0.92));
-                border: 1px solid rgba(148, 163, 184, 0.35);
-                border-radius: 12px;
-                padding: 0.75rem;
-            }
-            .hero-card {
-                background: linear-gradient(130deg, rgba(30, 58, 138, 0.65), rgba(22, 101, 52, 0.5));
-                border: 1px solid rgba(255, 255, 255, 0.12);
-                border-radius: 14px;
-                padding: 0.9rem 1rem;
-                margin-bottom: 0.8rem;
-            }
-            .hero-card h3 {
-                margin: 0;
-                font-size: 1.25rem;
-            }
-            .hero-card p {
-                margin: 0.2rem 0 0;
-                color: #dbeafe;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Streamlit drops any element a rerun does not re-emit, so the <style> block
+    # has to be sent every run; keep the payload a prebuilt module constant.
+    st.markdown(_THEME_CSS, unsafe_allow_html=True)
+
+def _json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+# Export snapshots are cached without their timestamp (which would make every
+# render a cache miss); the placeholder is swapped for a fresh one on each render.
+_CREATED_AT_PLACEHOLDER = b'"created_at": ""'
+
+
+@st.cache_data(max_entries=_CACHE_MAX_ENTRIES, show_spinner=False)
+def _snapshot_body(payload: dict) -> bytes:
+    return _json_dumps(payload)
+
+
+def _snapshot_bytes(payload: dict) -> bytes:
+    stamp = b'"created_at": ' + json.dumps(datetime.now().isoformat()).encode("utf-8")
+    return _snapshot_body(payload).replace(_CREATED_AT_PLACEHOLDER, stamp, 1)
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Same character class as str.isalnum() plus "-" and "_" (Unicode \w covers isalnum + "_").
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w-]")
+
 
 def _safe_filename(name: str) -> str:
-    return "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in name.strip())
+    return _UNSAFE_FILENAME_RE.sub("_", name.strip())
+
+
+class _SaveUnpickler(pickle.Unpickler):
+    """Save files only hold plain dicts, lists, strings and numbers; refuse anything else."""
+
+    def find_class(self, module: str, name: str):
+        raise pickle.UnpicklingError(f"Unexpected object in save file: {module}.{name}")
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _list_saves() -> List[str]:
+    # Saves are pickled; *.json files are saves from earlier versions.
+    return sorted(p.name for p in SAVE_DIR.iterdir() if p.suffix in (".pkl", ".json"))
+
+
+@st.cache_resource(show_spinner=False)
+def _new_file_mode() -> int:
+    # os.umask can only be read by setting it, which races with other session
+    # threads; do it once per process rather than on every save.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
 
 
 def save_current_game():
@@ -84,22 +157,54 @@ def save_current_game():
     ledger: Ledger = st.session_state.ledger
     settings: Dict[str, object] = st.session_state.settings
 
-    payload = {
-        "meta": {
-            "saved_at": datetime.now().isoformat(),
-            "app_version": 1
-        },
+    state = {
         "settings": settings,
         "players": {name: {"name": p.name, "active": p.active} for name, p in players.items()},
         "ledger": {
-            "buyins": ledger.buyins,
-            "cashouts": ledger.cashouts,
+            "buyins": dict(ledger.buyins),
+            "cashouts": dict(ledger.cashouts),
         },
     }
-    fname = _safe_filename(str(settings.get("game_name", "home_game"))) + ".json"
+    fname = _safe_filename(str(settings.get("game_name", "home_game"))) + ".pkl"
     fpath = SAVE_DIR / fname
-    with open(fpath, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+
+    # Skip the rewrite when nothing changed since the last save of this file
+    # ("meta" is left out of the hash since saved_at differs on every call),
+    # unless the file on disk was replaced or edited since (e.g. by another session).
+    state_hash = hash((fname, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)))
+    last_save = st.session_state.get("_last_save")
+    if last_save is not None and last_save[0] == state_hash:
+        try:
+            stat = fpath.stat()
+        except FileNotFoundError:
+            stat = None
+        if stat is not None and last_save[1:] == (stat.st_mtime_ns, stat.st_size):
+            st.toast(f"No changes since last save to {fpath.name}")
+            return
+
+    payload = {
+        "meta": {
+            "saved_at": datetime.now().isoformat(),
+            "app_version": 1
+        },
+        **state,
+    }
+    # Write to a uniquely named sibling temp file and rename over the save, so
+    # an interrupted run (or a concurrent save of the same game from another
+    # session) never leaves a truncated file behind.
+    fd, tmp_name = tempfile.mkstemp(dir=SAVE_DIR, prefix=f".{fpath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        # mkstemp creates the file 0600; give the save the mode a plain open() would.
+        os.chmod(tmp_name, _new_file_mode())
+        os.replace(tmp_name, fpath)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    stat = fpath.stat()
+    st.session_state["_last_save"] = (state_hash, stat.st_mtime_ns, stat.st_size)
+    _list_saves.clear()
     st.toast(f"Saved game to {fpath.name}")
 
 
@@ -108,173 +213,157 @@ def load_game(filename: str):
     if not fpath.exists():
         st.error("Save file not found.")
         return
-    with open(fpath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    settings = data.get("settings", {})
-    players_raw = data.get("players", {})
-    ledger_raw = data.get("ledger", {})
+    try:
+        raw = fpath.read_bytes()
+        data = _SaveUnpickler(io.BytesIO(raw)).load() if fpath.suffix == ".pkl" else _json_loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("not a saved game")
+        settings = data.get("settings", {})
+        players = {name: Player(**attrs) for name, attrs in data.get("players", {}).items()}
+        ledger_raw = data.get("ledger", {})
+        ledger = Ledger(
+            buyins={k: float(v) for k, v in ledger_raw.get("buyins", {}).items()},
+            cashouts={k: float(v) for k, v in ledger_raw.get("cashouts", {}).items()},
+        )
+    except Exception as exc:  # damaged bytes can surface as almost any error type
+        st.error(f"Could not load {filename}: {exc}")
+        return
 
     st.session_state.settings = settings
-    st.session_state.players = {name: Player(**attrs) for name, attrs in players_raw.items()}
-    led = Ledger()
-    led.buyins = {k: float(v) for k, v in ledger_raw.get("buyins", {}).items()}
-    led.cashouts = {k: float(v) for k, v in ledger_raw.get("cashouts", {}).items()}
-    st.session_state.ledger = led
+    st.session_state.players = players
+    st.session_state.ledger = ledger
 
 # ----------------------------
-# Streamlit UI
+# Table/export helpers
 # ----------------------------
 
-st.set_page_config(page_title="AllInBank", page_icon="♠️", layout="wide")
-apply_theme()
+@st.cache_data(max_entries=_CACHE_MAX_ENTRIES, show_spinner=False)
+def _csv_bytes(items: tuple, cols: tuple) -> bytes:
+    return pd.DataFrame(items, columns=list(cols)).to_csv(index=False).encode("utf-8")
 
-# Init session state
-if "players" not in st.session_state:
-    st.session_state.players: Dict[str, Player] = {}
-if "ledger" not in st.session_state:
-    st.session_state.ledger = Ledger()
-if "settings" not in st.session_state:
-    st.session_state.settings = {
-        "currency": "$",
-        "default_buyin": 10.0,
-        "game_name": f"Home Game {datetime.now().strftime('%Y-%m-%d')}"
-    }
 
-players: Dict[str, Player] = st.session_state.players
-ledger: Ledger = st.session_state.ledger
-settings: Dict[str, object] = st.session_state.settings
+@st.cache_data(max_entries=_CACHE_MAX_ENTRIES, show_spinner=False)
+def _buyin_chart_spec(items: tuple, currency: str) -> dict:
+    import altair as alt  # deferred: only pay the import once a chart is drawn
 
-# Sidebar controls for Save/Load
-st.sidebar.header("♠️ Menu")
-mode = st.sidebar.radio("Mode", ["Start new game", "Continue from save"], horizontal=False)
+    df = pd.DataFrame(list(items), columns=["Player", "Buyin"])
+    return (
+        alt.Chart(df)
+        .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
+        .encode(
+            x=alt.X("Player:N", sort="-y", axis=alt.Axis(labelAngle=0)),
+            y=alt.Y("Buyin:Q", title=f"Buy-ins ({currency})"),
+            color=alt.Color("Buyin:Q", scale=alt.Scale(scheme="blues"), legend=None),
+            tooltip=["Player", alt.Tooltip("Buyin:Q", format=".2f")],
+        )
+        .properties(height=280, width=400)
+        .to_dict()
+    )
 
-if mode == "Start new game":
-    new_name = st.sidebar.text_input("New game name", value=str(settings.get("game_name", "Home Game")), key="sb_game_name")
-    default_buyin = st.sidebar.number_input("Default buy‑in", min_value=1.0, step=1.0, value=float(settings.get("default_buyin", 10.0)), key="sb_default_buyin")
-    currency = st.sidebar.text_input("Currency symbol", value=str(settings.get("currency", "$")), key="sb_currency")
-    if st.sidebar.button("Start New", use_container_width=True):
-        st.session_state.players = {}
-        st.session_state.ledger = Ledger()
-        st.session_state.settings = {
-            "currency": currency or "$",
-            "default_buyin": float(default_buyin),
-            "game_name": new_name or f"Home Game {datetime.now().strftime('%Y-%m-%d')}"
-        }
-        st.sidebar.success("Started new game")
-else:
-    saves = sorted([p.name for p in SAVE_DIR.glob("*.json")])
-    if not saves:
-        st.sidebar.info("No saves yet — start a new game first.")
-    else:
-        sel = st.sidebar.selectbox("Choose a save", options=saves)
-        load_cols = st.sidebar.columns(2)
-        if load_cols[0].button("Load", use_container_width=True, disabled=not sel):
-            load_game(sel)
-        if load_cols[1].button("Save current", use_container_width=True):
-            save_current_game()
 
-# Always show a quick save option
-st.sidebar.button("💾 Save now", use_container_width=True, on_click=save_current_game)
+@st.cache_data(max_entries=_CACHE_MAX_ENTRIES, show_spinner=False)
+def _net_chart_spec(items: tuple, currency: str) -> dict:
+    import altair as alt  # deferred: only pay the import once a chart is drawn
 
-# Header
-hero_left, hero_right = st.columns([0.75, 0.25])
-with hero_left:
-    st.markdown(
-        f"""
-        <div class="hero-card">
-            <h3>♠️ AllInBank · {settings['game_name']}</h3>
-            <p>Track buy-ins, rebuys, and cash-outs. Close every session with fair payouts.</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
+    df = pd.DataFrame(list(items), columns=["Player", "Net"])
+    return (
+        alt.Chart(df)
+        .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
+        .encode(
+            x=alt.X("Player:N", sort=None, axis=alt.Axis(labelAngle=0)),
+            y=alt.Y("Net:Q", title=f"Net ({currency})"),
+            color=alt.condition("datum.Net >= 0", alt.value("#22c55e"), alt.value("#ef4444")),
+            tooltip=["Player", alt.Tooltip("Net:Q", format=".2f")],
+        )
+        .properties(height=300)
+        .to_dict()
     )
-with hero_right:
-    settings["game_name"] = st.text_input("Game name", value=str(settings["game_name"]), key="hdr_game_name")
-    settings["currency"] = st.text_input("Currency symbol", value=str(settings["currency"]), key="hdr_currency")
-
-metric_1, metric_2, metric_3, metric_4 = st.columns(4)
-metric_1.metric("Players", len(players))
-metric_2.metric("Total Buy-ins", f"{settings['currency']}{ledger.total_buyin():.2f}")
-metric_3.metric("Total Cash-outs", f"{settings['currency']}{ledger.total_cashout():.2f}")
-metric_4.metric("Unmatched", f"{settings['currency']}{(ledger.total_cashout() - ledger.total_buyin()):.2f}")
-
-st.divider()
 
-# Player management
-st.subheader("1) Players")
-add_col1, add_col2 = st.columns([0.6, 0.4])
-with add_col1:
-    new_name = st.text_input("Add player name", placeholder="e.g., Alex")
-with add_col2:
-    if st.button("Add Player", use_container_width=True):
-        normalized_name = normalize_player_name(new_name)
-        if not normalized_name:
-            st.warning("Please enter a player name.")
-        elif normalized_name in players:
-            st.warning(f"Player '{normalized_name}' already exists.")
-        else:
-            players[normalized_name] = Player(name=normalized_name)
-            st.success(f"Added player {normalized_name}.")
+# ----------------------------
+# UI sections
+# ----------------------------
+# Each input section is a fragment, so its own widgets only rerun that block.
+# Anything that changes the roster or the ledger triggers a full rerun so the
+# metrics, the other sections and the settlement pick up the new state.
+
+@st.fragment
+def _players_section(players: Dict[str, Player], ledger: Ledger, names: List[str]) -> None:
+    st.subheader("1) Players")
+    add_col1, add_col2 = st.columns([0.6, 0.4])
+    with add_col1:
+        new_name = st.text_input("Add player name", placeholder="e.g., Alex")
+    with add_col2:
+        if st.button("Add Player", use_container_width=True):
+            normalized_name = normalize_player_name(new_name)
+            if not normalized_name:
+                st.warning("Please enter a player name.")
+            elif normalized_name in players:
+                st.warning(f"Player '{normalized_name}' already exists.")
+            else:
+                players[normalized_name] = Player(name=normalized_name)
+                st.toast(f"Added player {normalized_name}.")
+                st.rerun()
+
+    if players:
+        buyins_map = ledger.buyins
+        cashouts_map = ledger.cashouts
+        df_players = pd.DataFrame({
+            "Player": names,
+            "Active": [players[n].active for n in names],
+            "Total Buy‑in": [buyins_map.get(n, 0.0) for n in names],
+            "Cash‑out": [cashouts_map.get(n, 0.0) for n in names],
+        })
+        st.dataframe(df_players, use_container_width=True, hide_index=True)
+    else:
+        st.info("Add a few players to get started.")
 
-if players:
-    names = list(players.keys())
-    df_players = pd.DataFrame({
-        "Player": names,
-        "Active": [players[n].active for n in names],
-        "Total Buy‑in": [ledger.buyins.get(n, 0.0) for n in names],
-        "Cash‑out": [ledger.cashouts.get(n, 0.0) for n in names],
-    })
-    st.dataframe(df_players, use_container_width=True, hide_index=True)
-else:
-    st.info("Add a few players to get started.")
 
-st.divider()
+@st.fragment
+def _buyin_section(
+    ledger: Ledger, settings: Dict[str, object], names: List[str], buyins_sorted: tuple
+) -> None:
+    st.subheader("2) Buy‑ins & Rebuys")
+    if not names:
+        st.info("Add players first.")
+        return
 
-# Buy‑ins / Rebuys
-st.subheader("2) Buy‑ins & Rebuys")
-if not players:
-    st.info("Add players first.")
-else:
     bcol1, bcol2, bcol3 = st.columns([0.5, 0.25, 0.25])
     with bcol1:
-        sel_player = st.selectbox("Player", options=list(players.keys()), key="buyin_player")
+        sel_player = st.selectbox("Player", options=names, key="buyin_player")
     with bcol2:
         amt = float(st.number_input("Amount", min_value=0.0, step=5.0, value=float(settings["default_buyin"])) )
     with bcol3:
         if st.button("Record Buy‑in / Rebuy", use_container_width=True):
             ledger.add_buyin(sel_player, amt)
-            st.success(f"Recorded {settings['currency']}{amt:.2f} buy‑in for {sel_player}.")
+            st.toast(f"Recorded {settings['currency']}{amt:.2f} buy‑in for {sel_player}.")
+            st.rerun()
 
     # running ledger view
-    if ledger.buyins:
-        df_b = pd.DataFrame(sorted(ledger.buyins.items()), columns=["Player", "Total Buy‑in"])
+    if buyins_sorted:
+        df_b = pd.DataFrame(buyins_sorted, columns=["Player", "Total Buy‑in"])
         st.dataframe(df_b, use_container_width=True, hide_index=True)
 
     # Chart: Buy‑ins per player
-    if ledger.buyins:
+    if buyins_sorted:
         st.markdown("**Buy‑ins per player**")
-        df_b_plot = pd.DataFrame({"Player": list(ledger.buyins.keys()), "Buyin": list(ledger.buyins.values())})
-        chart_b = (
-            alt.Chart(df_b_plot)
-            .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-            .encode(
-                x=alt.X("Player:N", sort="-y", axis=alt.Axis(labelAngle=0)),
-                y=alt.Y("Buyin:Q", title=f"Buy-ins ({settings['currency']})"),
-                color=alt.Color("Buyin:Q", scale=alt.Scale(scheme="blues"), legend=None),
-                tooltip=["Player", alt.Tooltip("Buyin:Q", format=".2f")],
-            )
-            .properties(height=280, width=400)
-        )
-        st.altair_chart(chart_b, use_container_width=True)
-
-st.divider()
+        spec_b = _buyin_chart_spec(buyins_sorted, str(settings["currency"]))
+        st.vega_lite_chart(spec_b, use_container_width=True)
+
+
+@st.fragment
+def _cashout_section(
+    ledger: Ledger,
+    settings: Dict[str, object],
+    names: List[str],
+    cashouts_sorted: tuple,
+    tot_in: float,
+    tot_out: float,
+) -> None:
+    st.subheader("3) End-of-Game Cash-outs")
+    if not names:
+        st.info("Add players first.")
+        return
 
-# Cash‑outs (Dropdown entry per player)
-st.subheader("3) End-of-Game Cash-outs")
-if not players:
-    st.info("Add players first.")
-else:
     cc0 = st.columns([1.0])[0]
     with cc0:
         co_mode = st.radio(
@@ -286,7 +375,7 @@ else:
 
     cc1, cc2, cc3 = st.columns([0.5, 0.25, 0.25])
     with cc1:
-        sel_player_co = st.selectbox("Select player", options=list(players.keys()), key="cashout_player")
+        sel_player_co = st.selectbox("Select player", options=names, key="cashout_player")
     with cc2:
         current_total = float(ledger.cashouts.get(sel_player_co, 0.0))
         default_val = 0.0 if co_mode.startswith("Add") else current_total
@@ -304,15 +393,17 @@ else:
             if st.button("Add Cash-out", use_container_width=True, key="btn_add_cashout"):
                 ledger.add_cashout(sel_player_co, amt_co)
                 new_total = ledger.cashouts.get(sel_player_co, 0.0)
-                st.success(
+                st.toast(
                     f"Added {settings['currency']}{amt_co:.2f} for {sel_player_co}. Total cash-out is now {settings['currency']}{new_total:.2f}."
                 )
+                st.rerun()
         else:
             if st.button("Set Cash-out", use_container_width=True, key="btn_set_cashout"):
                 ledger.set_cashout(sel_player_co, amt_co)
-                st.success(
+                st.toast(
                     f"Set cash-out for {sel_player_co} to {settings['currency']}{amt_co:.2f}."
                 )
+                st.rerun()
 
     st.caption(
         f"Current recorded cash-out for {sel_player_co}: {settings['currency']}{current_total:.2f}. "
@@ -320,40 +411,142 @@ else:
     )
 
     # Table of all cash-outs
-    df_cash = (
-        pd.DataFrame(sorted(ledger.cashouts.items()), columns=["Player", "Cash-out"])
-        if ledger.cashouts else
-        pd.DataFrame(columns=["Player", "Cash-out"])
-    )
+    df_cash = pd.DataFrame(cashouts_sorted, columns=["Player", "Cash-out"])
     st.dataframe(df_cash, use_container_width=True, hide_index=True)
 
     # Totals sanity check
-    total_in = ledger.total_buyin()
-    total_out = ledger.total_cashout()
-    delta = round(total_out - total_in, 2)
+    delta = round(tot_out - tot_in, 2)
     if abs(delta) > 0.009:
         st.warning(
             f"⚠️ Totals don't match. "
-            f"Buy-ins: {settings['currency']}{total_in:.2f} vs "
-            f"Cash-outs: {settings['currency']}{total_out:.2f}. "
+            f"Buy-ins: {settings['currency']}{tot_in:.2f} vs "
+            f"Cash-outs: {settings['currency']}{tot_out:.2f}. "
             f"Difference: {settings['currency']}{delta:.2f}"
         )
     else:
         st.success(
-            f"Totals match ✔ Buy-ins = {settings['currency']}{total_in:.2f}, "
-            f"Cash-outs = {settings['currency']}{total_out:.2f}"
+            f"Totals match ✔ Buy-ins = {settings['currency']}{tot_in:.2f}, "
+            f"Cash-outs = {settings['currency']}{tot_out:.2f}"
         )
 
+# ----------------------------
+# Streamlit UI
+# ----------------------------
+
+st.set_page_config(page_title="AllInBank", page_icon="♠️", layout="wide")
+apply_theme()
+
+# Init session state
+if "players" not in st.session_state:
+    st.session_state.players: Dict[str, Player] = {}
+if "ledger" not in st.session_state:
+    st.session_state.ledger = Ledger()
+if "settings" not in st.session_state:
+    st.session_state.settings = {
+        "currency": "$",
+        "default_buyin": 10.0,
+        "game_name": f"Home Game {datetime.now().strftime('%Y-%m-%d')}"
+    }
+
+players: Dict[str, Player] = st.session_state.players
+ledger: Ledger = st.session_state.ledger
+settings: Dict[str, object] = st.session_state.settings
+
+# Sidebar controls for Save/Load
+st.sidebar.header("♠️ Menu")
+mode = st.sidebar.radio("Mode", ["Start new game", "Continue from save"], horizontal=False)
+
+if mode == "Start new game":
+    new_name = st.sidebar.text_input("New game name", value=str(settings.get("game_name", "Home Game")), key="sb_game_name")
+    default_buyin = st.sidebar.number_input("Default buy‑in", min_value=1.0, step=1.0, value=float(settings.get("default_buyin", 10.0)), key="sb_default_buyin")
+    currency = st.sidebar.text_input("Currency symbol", value=str(settings.get("currency", "$")), key="sb_currency")
+    if st.sidebar.button("Start New", use_container_width=True):
+        st.session_state.players = {}
+        st.session_state.ledger = Ledger()
+        st.session_state.settings = {
+            "currency": currency or "$",
+            "default_buyin": float(default_buyin),
+            "game_name": new_name or f"Home Game {datetime.now().strftime('%Y-%m-%d')}"
+        }
+        st.sidebar.success("Started new game")
+    st.sidebar.button("💾 Save now", use_container_width=True, on_click=save_current_game)
+else:
+    saves = _list_saves()
+    if not saves:
+        st.sidebar.info("No saves yet — start a new game first.")
+        st.sidebar.button("💾 Save now", use_container_width=True, on_click=save_current_game)
+    else:
+        sel = st.sidebar.selectbox("Choose a save", options=saves)
+        load_cols = st.sidebar.columns(2)
+        if load_cols[0].button("Load", use_container_width=True, disabled=not sel):
+            load_game(sel)
+        load_cols[1].button("Save current", use_container_width=True, on_click=save_current_game)
+
+# "Start New" / "Load" swap the session objects; rebind so the sections below
+# (and the fragments, which keep these arguments between their own reruns)
+# work on the current game.
+players = st.session_state.players
+ledger = st.session_state.ledger
+settings = st.session_state.settings
+# Sorted views shared by the tables, the buy-in chart and the CSV exports.
+buyins_sorted = tuple(sorted(ledger.buyins.items()))
+cashouts_sorted = tuple(sorted(ledger.cashouts.items()))
+
+# Header
+hero_left, hero_right = st.columns([0.75, 0.25])
+with hero_left:
+    st.markdown(
+        f"""
+        <div class="hero-card">
+            <h3>♠️ AllInBank · {settings['game_name']}</h3>
+            <p>Track buy-ins, rebuys, and cash-outs. Close every session with fair payouts.</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+with hero_right:
+    settings["game_name"] = st.text_input("Game name", value=str(settings["game_name"]), key="hdr_game_name")
+    settings["currency"] = st.text_input("Currency symbol", value=str(settings["currency"]), key="hdr_currency")
+
+tot_in = tot_out = 0.0
+metric_1, metric_2, metric_3, metric_4 = st.columns(4)
+metric_1.metric("Players", len(players))
+if ledger.buyins or ledger.cashouts:
+    tot_in = ledger.total_buyin()
+    tot_out = ledger.total_cashout()
+    delta = round(tot_out - tot_in, 2)
+    metric_2.metric("Total Buy-ins", f"{settings['currency']}{tot_in:.2f}")
+    metric_3.metric("Total Cash-outs", f"{settings['currency']}{tot_out:.2f}")
+    metric_4.metric("Unmatched", f"{settings['currency']}{delta:.2f}")
+else:
+    metric_2.metric("Total Buy-ins", _EMPTY_METRIC)
+    metric_3.metric("Total Cash-outs", _EMPTY_METRIC)
+    metric_4.metric("Unmatched", _EMPTY_METRIC)
+
+st.divider()
+
+# Ledger state is settled for the rest of this run: every mutation below reruns the app.
+names = list(players)
+
+_players_section(players, ledger, names)
+
+st.divider()
+
+_buyin_section(ledger, settings, names, buyins_sorted)
+
+st.divider()
+
+_cashout_section(ledger, settings, names, cashouts_sorted, tot_in, tot_out)
+
 st.divider()
 
 
 # Settlement
 st.subheader("4) Settlement — Who owes whom?")
 if players:
-    all_names = list(players.keys())
-    bals = ledger.balances(all_names)
-    df_bal = pd.DataFrame([{ "Player": k, "Net": v } for k, v in bals.items()])
-    df_bal.sort_values("Net", ascending=False, inplace=True)
+    bals = ledger.balances(names)
+    sorted_bals = sorted(bals.items(), key=lambda kv: kv[1], reverse=True)
+    df_bal = pd.DataFrame({"Player": [k for k, _ in sorted_bals], "Net": [v for _, v in sorted_bals]})
 
     biggest_winner = df_bal.iloc[0] if not df_bal.empty else None
     biggest_payer = df_bal.iloc[-1] if not df_bal.empty else None
@@ -372,18 +565,8 @@ if players:
 
         # Chart: Net per player
         if not df_bal.empty:
-            chart_net = (
-                alt.Chart(df_bal)
-                .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-                .encode(
-                    x=alt.X("Player:N", sort=None, axis=alt.Axis(labelAngle=0)),
-                    y=alt.Y("Net:Q", title=f"Net ({settings['currency']})"),
-                    color=alt.condition("datum.Net >= 0", alt.value("#22c55e"), alt.value("#ef4444")),
-                    tooltip=["Player", alt.Tooltip("Net:Q", format=".2f")],
-                )
-                .properties(height=300)
-            )
-            st.altair_chart(chart_net, use_container_width=True)
+            spec_net = _net_chart_spec(tuple(sorted_bals), str(settings["currency"]))
+            st.vega_lite_chart(spec_net, use_container_width=True)
 
     transfers = min_cash_flow_settlement(bals)
     with cols2:
@@ -399,37 +582,35 @@ if players:
     export_payload = {
         "game_name": settings["game_name"],
         "currency": settings["currency"],
-        "created_at": datetime.now().isoformat(),
-        "players": list(players.keys()),
-        "buyins": ledger.buyins,
-        "cashouts": ledger.cashouts,
+        "created_at": "",  # stamped per render by _snapshot_bytes
+        "players": names,
+        "buyins": dict(ledger.buyins),
+        "cashouts": dict(ledger.cashouts),
         "balances": bals,
         "transfers": transfers,
-        "total_buyin": ledger.total_buyin(),
-        "total_cashout": ledger.total_cashout(),
+        "total_buyin": tot_in,
+        "total_cashout": tot_out,
     }
 
-    json_bytes = json.dumps(export_payload, indent=2).encode("utf-8")
     st.download_button(
         label="Download JSON snapshot",
-        data=json_bytes,
+        data=_snapshot_bytes(export_payload),
         file_name=f"{str(settings['game_name']).replace(' ', '_').lower()}_snapshot.json",
         mime="application/json",
         use_container_width=True,
     )
 
     # CSV exports
-    df_buyins = pd.DataFrame(sorted(ledger.buyins.items()), columns=["Player", "Total_Buyin"]) if ledger.buyins else pd.DataFrame(columns=["Player","Total_Buyin"]) 
-    df_cashouts = pd.DataFrame(sorted(ledger.cashouts.items()), columns=["Player", "Cashout"]) if ledger.cashouts else pd.DataFrame(columns=["Player","Cashout"]) 
-    df_transfers = pd.DataFrame(transfers, columns=["From","To","Amount"]) if transfers else pd.DataFrame(columns=["From","To","Amount"]) 
-
     c1, c2, c3 = st.columns(3)
     with c1:
-        st.download_button("Buy‑ins CSV", df_buyins.to_csv(index=False).encode("utf-8"), "buyins.csv", "text/csv", use_container_width=True)
+        buyins_csv = _csv_bytes(buyins_sorted, ("Player", "Total_Buyin"))
+        st.download_button("Buy‑ins CSV", buyins_csv, "buyins.csv", "text/csv", use_container_width=True)
     with c2:
-        st.download_button("Cash‑outs CSV", df_cashouts.to_csv(index=False).encode("utf-8"), "cashouts.csv", "text/csv", use_container_width=True)
+        cashouts_csv = _csv_bytes(cashouts_sorted, ("Player", "Cashout"))
+        st.download_button("Cash‑outs CSV", cashouts_csv, "cashouts.csv", "text/csv", use_container_width=True)
     with c3:
-        st.download_button("Transfers CSV", df_transfers.to_csv(index=False).encode("utf-8"), "transfers.csv", "text/csv", use_container_width=True)
+        transfers_csv = _csv_bytes(tuple(transfers), ("From", "To", "Amount"))
+        st.download_button("Transfers CSV", transfers_csv, "transfers.csv", "text/csv", use_container_width=True)
 
 # Footer
 st.divider()
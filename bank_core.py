@@ -1,24 +1,34 @@
 from __future__ import annotations
 
+import heapq
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     name: str
     active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Ledger:
     """Tracks money flows per player."""
 
-    buyins: Dict[str, float] = field(default_factory=dict)
-    cashouts: Dict[str, float] = field(default_factory=dict)
+    buyins: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    cashouts: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def __post_init__(self) -> None:
+        # Plain dicts passed in (e.g. from a save file) get the zero default too.
+        if not isinstance(self.buyins, defaultdict):
+            self.buyins = defaultdict(float, self.buyins)
+        if not isinstance(self.cashouts, defaultdict):
+            self.cashouts = defaultdict(float, self.cashouts)
 
     def add_buyin(self, player: str, amount: float) -> None:
-        self.buyins[player] = self.buyins.get(player, 0.0) + float(amount)
+        self.buyins[player] += float(amount)
 
     def set_cashout(self, player: str, amount: float) -> None:
         """Replace the player's cash-out with an absolute amount."""
@@ -26,7 +36,7 @@ class Ledger:
 
     def add_cashout(self, player: str, amount: float) -> None:
         """Add (increment) to the player's existing cash-out total."""
-        self.cashouts[player] = self.cashouts.get(player, 0.0) + float(amount)
+        self.cashouts[player] += float(amount)
 
     def total_buyin(self) -> float:
         return float(sum(self.buyins.values()))
@@ -55,48 +65,54 @@ def min_cash_flow_settlement(balances: Dict[str, float]) -> List[Tuple[str, str,
 
     Greedy approach:
     - Repeatedly match the most negative with the most positive balance.
-    - Transfer min(abs(neg), pos). Update and continue until all within epsilon.
+    - Transfer min(abs(neg), pos). Update and continue until all are settled.
+    - Amounts are worked in whole cents, so there is no float drift to absorb.
+
+    Results are memoized on the balances, so repeated calls with an unchanged
+    ledger (e.g. every UI rerun) skip the computation.
     """
-    eps = 1e-9
-    debtors: List[Tuple[str, float]] = []
-    creditors: List[Tuple[str, float]] = []
-
-    for name, net in balances.items():
-        if net < -eps:
-            debtors.append((name, net))
-        elif net > eps:
-            creditors.append((name, net))
-
-    # Sort: debtors ascending (most negative first), creditors descending (most positive first)
-    debtors.sort(key=lambda x: x[1])  # more negative first
-    creditors.sort(key=lambda x: x[1], reverse=True)  # more positive first
-
-    i = 0
-    j = 0
-    transfers: List[Tuple[str, str, float]] = []
+    if not balances:
+        return []
+    return list(_settle_cached(tuple(balances.items())))
+
+
+@lru_cache(maxsize=64)
+def _settle_cached(items: Tuple[Tuple[str, float], ...]) -> Tuple[Tuple[str, str, float], ...]:
+    # Heaps keyed on balance in cents: debtors most negative first, creditors
+    # (negated) most positive first. Only the current extreme on each side is
+    # ever needed. One pass converts to cents and partitions.
+    debt_heap: List[Tuple[int, str]] = []
+    cred_heap: List[Tuple[int, str]] = []
+    for name, net in items:
+        cents = int(round(net * 100))
+        if cents < 0:
+            debt_heap.append((cents, name))
+        elif cents > 0:
+            cred_heap.append((-cents, name))
+    if not debt_heap or not cred_heap:
+        return ()
+    heapq.heapify(debt_heap)
+    heapq.heapify(cred_heap)
 
-    while i < len(debtors) and j < len(creditors):
-        debtor_name, debtor_amt = debtors[i]
-        creditor_name, creditor_amt = creditors[j]
+    transfers: List[Tuple[str, str, float]] = []
 
-        pay = round(min(-debtor_amt, creditor_amt), 2)
-        if pay > 0:
-            transfers.append((debtor_name, creditor_name, pay))
-            debtor_amt += pay  # debtor_amt is negative
-            creditor_amt -= pay
+    while debt_heap and cred_heap:
+        debtor_amt, debtor_name = heapq.heappop(debt_heap)
+        neg_creditor_amt, creditor_name = heapq.heappop(cred_heap)
+        creditor_amt = -neg_creditor_amt
 
-        # Move pointers
-        if debtor_amt >= -eps:
-            i += 1
-        else:
-            debtors[i] = (debtor_name, debtor_amt)
+        pay = min(-debtor_amt, creditor_amt)
+        transfers.append((debtor_name, creditor_name, pay / 100))
+        debtor_amt += pay  # debtor_amt is negative
+        creditor_amt -= pay
 
-        if creditor_amt <= eps:
-            j += 1
-        else:
-            creditors[j] = (creditor_name, creditor_amt)
+        # Push back whoever still has a residual balance
+        if debtor_amt < 0:
+            heapq.heappush(debt_heap, (debtor_amt, debtor_name))
+        if creditor_amt > 0:
+            heapq.heappush(cred_heap, (-creditor_amt, creditor_name))
 
-    return transfers
+    return tuple(transfers)
 
 
 def normalize_player_name(name: str) -> str:
@@ -26,3 +26,55 @@ def test_min_cash_flow_settlement_balances_to_zero():
     transfers = min_cash_flow_settlement(balances)
 
     assert transfers == [("Alex", "Bri", 15.0)]
+
+
+def test_min_cash_flow_settlement_returns_fresh_list_per_call():
+    balances = {"Alex": -10.0, "Bri": -5.0, "Casey": 15.0}
+    first = min_cash_flow_settlement(balances)
+    first.append(("mutated", "by", 0.0))
+
+    assert min_cash_flow_settlement(dict(balances)) == [("Alex", "Casey", 10.0), ("Bri", "Casey", 5.0)]
+
+
+def test_min_cash_flow_settlement_settles_every_balance():
+    balances = {"Alex": -12.5, "Bri": -7.25, "Casey": 4.75, "Dana": 15.0, "Eli": 0.0}
+    transfers = min_cash_flow_settlement(balances)
+
+    remaining = dict(balances)
+    for debtor, creditor, amount in transfers:
+        remaining[debtor] += amount
+        remaining[creditor] -= amount
+    assert all(abs(net) < 1e-9 for net in remaining.values())
+    assert transfers[0] == ("Alex", "Dana", 12.5)
+
+
+def test_min_cash_flow_settlement_works_in_whole_cents():
+    balances = {"Alex": -(0.1 + 0.2), "Bri": 0.1, "Casey": 0.2, "Dana": 0.001}
+    transfers = min_cash_flow_settlement(balances)
+
+    assert transfers == [("Alex", "Casey", 0.2), ("Alex", "Bri", 0.1)]
+
+
+def test_ledger_accumulates_on_plain_dict_input():
+    ledger = Ledger(buyins={"Alex": 10.0}, cashouts={})
+    ledger.add_buyin("Alex", 5)
+    ledger.add_buyin("Bri", 20)
+    ledger.add_cashout("Bri", 7.5)
+
+    assert ledger.buyins == {"Alex": 15.0, "Bri": 20.0}
+    assert ledger.cashouts == {"Bri": 7.5}
+
+
+def test_min_cash_flow_settlement_without_open_balances():
+    assert min_cash_flow_settlement({}) == []
+    assert min_cash_flow_settlement({"Alex": 0.0, "Bri": 0.0}) == []
+    assert min_cash_flow_settlement({"Alex": 0.0, "Bri": 5.0}) == []
+
+
+def test_ledger_balances_round_like_python_round_for_any_roster_size():
+    names = [f"P{i}" for i in range(40)]
+    ledger = Ledger()
+    ledger.add_buyin("P0", 476.856)
+    ledger.add_cashout("P0", 46.281)
+
+    assert ledger.balances(names)["P0"] == ledger.balances(["P0"])["P0"] == -430.57
@@ -0,0 +1,100 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = Path(__file__).resolve().parents[1] / "AllInBank.py"
+
+
+class _TouchOnLoad:
+    """Unpickling this runs Path.touch(marker) unless globals are refused."""
+
+    def __init__(self, marker: Path):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (Path.touch, (self.marker,))
+
+
+def _load_save(filename: str) -> AppTest:
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    at.run()
+    at.sidebar.radio[0].set_value("Continue from save").run()
+    at.sidebar.selectbox[0].select(filename).run()
+    next(b for b in at.sidebar.button if b.label == "Load").click().run()
+    return at
+
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    st.cache_data.clear()  # the saves listing is cached across app runs
+    saves = tmp_path / "poker_bank_saves"
+    saves.mkdir()
+    return saves
+
+
+def test_load_game_restores_pickled_save(save_dir):
+    payload = {
+        "settings": {"currency": "$", "default_buyin": 10.0, "game_name": "Friday"},
+        "players": {"Alex": {"name": "Alex", "active": True}},
+        "ledger": {"buyins": {"Alex": 20.0}, "cashouts": {}},
+    }
+    (save_dir / "Friday.pkl").write_bytes(pickle.dumps(payload))
+
+    at = _load_save("Friday.pkl")
+
+    assert not at.exception
+    assert not at.error
+    assert at.session_state.ledger.buyins == {"Alex": 20.0}
+
+
+def test_load_game_refuses_pickled_globals(save_dir, tmp_path):
+    marker = tmp_path / "pwned"
+    (save_dir / "evil.pkl").write_bytes(pickle.dumps({"x": _TouchOnLoad(marker)}))
+
+    at = _load_save("evil.pkl")
+
+    assert not marker.exists()
+    assert not at.exception
+    assert "Could not load evil.pkl" in at.error[0].value
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        ("empty.pkl", b""),
+        ("list.pkl", pickle.dumps(["not", "a", "game"])),
+        ("broken.json", b'{"settings": '),
+        ("list.json", json.dumps([1, 2]).encode("utf-8")),
+    ],
+)
+def test_load_game_reports_damaged_saves(save_dir, filename, content):
+    (save_dir / filename).write_bytes(content)
+
+    at = _load_save(filename)
+
+    assert not at.exception
+    assert f"Could not load {filename}" in at.error[0].value
+
+
+def test_save_rewrites_file_changed_on_disk(save_dir):
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    at.run()
+    save_now = next(b for b in at.sidebar.button if b.label == "💾 Save now")
+    save_now.click().run()
+    (save_file,) = save_dir.iterdir()
+    saved = save_file.read_bytes()
+
+    save_now.click().run()
+    assert at.toast[0].value.startswith("No changes since last save")
+
+    save_file.write_bytes(b"overwritten by another session")
+    save_now.click().run()
+
+    assert at.toast[0].value.startswith("Saved game to")
+    assert pickle.loads(save_file.read_bytes())["settings"] == pickle.loads(saved)["settings"]